@@ -0,0 +1,542 @@
+'''
+Generates synthetic SWMM .inp models for benchmarking
+
+The models are dendritic drainage networks: every node drains to a single
+downstream node through one link, and the networks end at outfalls. Node
+positions, inverts and link properties are drawn from a seeded random
+number generator, so the same size and seed always give the same file.
+
+The generated file covers every section swools reads (TITLE, OPTIONS,
+FILES, EVAPORATION, COORDINATES, VERTICES and POLYGONS) along with every
+element-keyed section used by SWMMProject.extract and SWMMProject.merge,
+and the sections those refer to, so the output is a valid model.
+'''
+
+import argparse
+import math
+import random
+from pathlib import Path
+
+# GLOBAL VARIABLES
+
+# the number of nodes draining to each outfall
+NODES_PER_OUTFALL = 1000
+
+# the share of non outfall nodes that are storage units
+STORAGE_FRACTION = 0.03
+
+# the share of non outfall nodes that are flow dividers
+DIVIDER_FRACTION = 0.01
+
+# the share of links that are not conduits, by type
+LINK_TYPE_FRACTIONS = {'PUMPS': 0.005,
+                       'ORIFICES': 0.01,
+                       'WEIRS': 0.01,
+                       'OUTLETS': 0.005}
+
+# FUNCTIONS
+def _header(section, columns):
+    '''
+    Returns the section header and the column comment lines
+
+    Parameters
+    ----------
+    section: str
+        the name of the section
+    columns: list of tuple
+        the (name, width) of each column
+
+    Returns
+    -------
+    list of str
+        the header lines
+    '''
+
+    names = ';;' + ' '.join(n.ljust(w) for n, w in columns)
+    rules = ';;' + ' '.join('-' * w for n, w in columns)
+    return ['[{}]\n'.format(section), names.rstrip() + '\n', rules + '\n']
+
+def _row(values, width=16):
+    '''
+    Returns the values of a row as a line of the .inp file
+    '''
+    return ' '.join(str(v).ljust(width) for v in values).rstrip() + '\n'
+
+def generate_model(n_elements, seed=0):
+    '''
+    Generates the lines of a synthetic SWMM .inp file
+
+    Parameters
+    ----------
+    n_elements: int
+        the number of nodes in the model. The model also has about one link
+        per node and one subcatchment for every two nodes
+    seed: int
+        the seed of the random number generator
+
+    Returns
+    -------
+    list of str
+        the lines of the .inp file
+    '''
+
+    rng = random.Random(seed)
+    n_outfalls = max(1, n_elements // NODES_PER_OUTFALL)
+
+    # lay out the network. node k drains to a node with a lower index, so
+    # every node ends up at one of the outfalls
+    names = []
+    xs = []
+    ys = []
+    inverts = []
+    parents = []
+    side = math.sqrt(n_elements) * 200.0
+    for k in range(n_elements):
+        if k < n_outfalls:
+            names.append('OF{}'.format(k))
+            xs.append(rng.uniform(0, side))
+            ys.append(rng.uniform(0, side))
+            inverts.append(round(rng.uniform(4900, 5000), 2))
+            parents.append(None)
+        else:
+            parent = (k - n_outfalls) // 2
+            angle = rng.uniform(0, 2 * math.pi)
+            length = rng.uniform(100, 400)
+            names.append('J{}'.format(k))
+            xs.append(xs[parent] + length * math.cos(angle))
+            ys.append(ys[parent] + length * math.sin(angle))
+            inverts.append(round(inverts[parent] + length * rng.uniform(0.002, 0.02), 2))
+            parents.append(parent)
+
+    storage = set(k for k in range(n_outfalls, n_elements)
+                  if rng.random() < STORAGE_FRACTION)
+
+    # a divider sends part of its flow down an extra conduit to the node
+    # below its downstream node
+    dividers = {}
+    for k in range(n_outfalls, n_elements):
+        if k not in storage and rng.random() < DIVIDER_FRACTION:
+            parent = parents[k]
+            if parents[parent] is not None:
+                dividers[k] = parents[parent]
+            else:
+                dividers[k] = parent
+
+    # give each link a type
+    link_types = {}
+    for k in range(n_outfalls, n_elements):
+        r = rng.random()
+        link_types[k] = 'CONDUITS'
+        for link_type, fraction in LINK_TYPE_FRACTIONS.items():
+            if r < fraction:
+                link_types[k] = link_type
+                break
+            r -= fraction
+
+    lines = []
+
+    lines += ['[TITLE]\n',
+              'Synthetic model with {} nodes, seed {}\n'.format(n_elements, seed),
+              '\n']
+
+    lines += ['[OPTIONS]\n',
+              ';;Options            Value\n',
+              ';;------------------ ------------\n']
+    options = [('FLOW_UNITS', 'CFS'),
+               ('INFILTRATION', 'HORTON'),
+               ('FLOW_ROUTING', rng.choice(['KINWAVE', 'DYNWAVE'])),
+               ('LINK_OFFSETS', 'DEPTH'),
+               ('MIN_SLOPE', 0),
+               ('ALLOW_PONDING', 'NO'),
+               ('SKIP_STEADY_STATE', 'NO'),
+               ('START_DATE', '01/01/2005'),
+               ('START_TIME', '00:00:00'),
+               ('REPORT_START_DATE', '01/01/2005'),
+               ('REPORT_START_TIME', '00:00:00'),
+               ('END_DATE', '01/06/2005'),
+               ('END_TIME', '00:00:00'),
+               ('SWEEP_START', '01/01'),
+               ('SWEEP_END', '12/31'),
+               ('DRY_DAYS', 0),
+               ('REPORT_STEP', '00:05:00'),
+               ('WET_STEP', '00:05:00'),
+               ('DRY_STEP', '01:00:00'),
+               ('ROUTING_STEP', 5),
+               ('RULE_STEP', '00:00:00'),
+               ('INERTIAL_DAMPING', 'PARTIAL'),
+               ('NORMAL_FLOW_LIMITED', 'BOTH'),
+               ('FORCE_MAIN_EQUATION', 'H-W'),
+               ('VARIABLE_STEP', 0.75),
+               ('LENGTHENING_STEP', 0),
+               ('MIN_SURFAREA', 12.557),
+               ('MAX_TRIALS', 8),
+               ('HEAD_TOLERANCE', 0.005),
+               ('SYS_FLOW_TOL', 5),
+               ('LAT_FLOW_TOL', 5),
+               ('MINIMUM_STEP', 0.5),
+               ('THREADS', rng.choice([1, 4, 8]))]
+    for param, value in options:
+        lines.append(param.ljust(21) + str(value) + '\n')
+    lines.append('\n')
+
+    lines += ['[FILES]\n',
+              'USE INFLOWS "C:\\Models\\Interface Files\\inflows_{}.txt"\n'.format(seed),
+              'SAVE HOTSTART "C:\\Models\\Hotstart\\model_{}.hsf"\n'.format(seed),
+              'SAVE OUTFLOWS "C:\\Models\\Interface Files\\outflows_{}.txt"\n'.format(seed),
+              '\n']
+
+    lines += _header('EVAPORATION', [('Data Source', 14), ('Parameters', 10)])
+    lines.append(_row(['CONSTANT', 0.1]))
+    lines.append(_row(['DRY_ONLY', 'NO']))
+    lines.append('\n')
+
+    lines += _header('RAINGAGES', [('Name', 14), ('Format', 9), ('Interval', 6),
+                                    ('SCF', 6), ('Source', 10)])
+    lines.append(_row(['RG1', 'INTENSITY', '0:05', 1.0, 'TIMESERIES', 'TS1']))
+    lines.append('\n')
+
+    # subcatchments drain to random nodes that are not outfalls
+    n_subcatchments = n_elements // 2
+    drainage_nodes = range(n_outfalls, n_elements)
+    outlets = []
+    if len(drainage_nodes) > 0:
+        outlets = [rng.choice(drainage_nodes) for s in range(n_subcatchments)]
+
+    lines += _header('SUBCATCHMENTS', [('Name', 14), ('Rain Gage', 16), ('Outlet', 16),
+                                        ('Area', 8), ('%Imperv', 8), ('Width', 8),
+                                        ('%Slope', 8), ('CurbLen', 8)])
+    for s, outlet in enumerate(outlets):
+        lines.append(_row(['S{}'.format(s), 'RG1', names[outlet],
+                           round(rng.uniform(0.5, 20), 3), round(rng.uniform(5, 95), 1),
+                           round(rng.uniform(100, 1000), 1), round(rng.uniform(0.5, 5), 2), 0]))
+    lines.append('\n')
+
+    lines += _header('SUBAREAS', [('Subcatchment', 14), ('N-Imperv', 10), ('N-Perv', 10),
+                                   ('S-Imperv', 10), ('S-Perv', 10), ('PctZero', 10),
+                                   ('RouteTo', 10)])
+    for s in range(len(outlets)):
+        lines.append(_row(['S{}'.format(s), 0.015, 0.24, 0.06, 0.3, 25, 'OUTLET']))
+    lines.append('\n')
+
+    lines += _header('INFILTRATION', [('Subcatchment', 14), ('MaxRate', 10), ('MinRate', 10),
+                                       ('Decay', 10), ('DryTime', 10), ('MaxInfil', 10)])
+    for s in range(len(outlets)):
+        lines.append(_row(['S{}'.format(s), 3.0, 0.5, 4, 7, 0]))
+    lines.append('\n')
+
+    lines += _header('LID_CONTROLS', [('Name', 14), ('Type/Layer', 10), ('Parameters', 10)])
+    lines.append(_row(['RB1', 'RB']))
+    lines.append(_row(['RB1', 'STORAGE', 36, 0.75, 0.5, 0]))
+    lines.append(_row(['RB1', 'DRAIN', 1, 0.5, 6, 6]))
+    lines.append('\n')
+
+    lid_subcatchments = [s for s in range(len(outlets)) if rng.random() < 0.05]
+    lines += _header('LID_USAGE', [('Subcatchment', 14), ('LID Process', 16), ('Number', 7),
+                                    ('Area', 10), ('Width', 10), ('InitSat', 10),
+                                    ('FromImp', 10), ('ToPerv', 10)])
+    for s in lid_subcatchments:
+        lines.append(_row(['S{}'.format(s), 'RB1', 4, 12, 0, 0, 50, 0]))
+    lines.append('\n')
+
+    lines += _header('AQUIFERS', [('Name', 14), ('Por', 6), ('WP', 6), ('FC', 6),
+                                   ('Ksat', 6), ('Kslope', 6), ('Tslope', 6), ('ETu', 6),
+                                   ('ETs', 6), ('Seep', 6), ('Ebot', 6), ('Egw', 6),
+                                   ('Umc', 6)])
+    lines.append(_row(['AQ1', 0.5, 0.15, 0.3, 0.1, 5, 10, 0.2, 0.1, 0.002, 0, 0, 0.2]))
+    lines.append('\n')
+
+    groundwater_subcatchments = [s for s in range(len(outlets)) if rng.random() < 0.05]
+    lines += _header('GROUNDWATER', [('Subcatchment', 14), ('Aquifer', 16), ('Node', 16),
+                                      ('Esurf', 6), ('A1', 6), ('B1', 6), ('A2', 6),
+                                      ('B2', 6), ('A3', 6), ('Dsw', 6), ('Egwt', 6)])
+    for s in groundwater_subcatchments:
+        outlet = outlets[s]
+        lines.append(_row(['S{}'.format(s), 'AQ1', names[outlet], round(inverts[outlet] + 10, 2),
+                           0.1, 1, 0, 0, 0, 0, round(inverts[outlet] + 5, 2)]))
+    lines.append('\n')
+
+    lines += _header('GWF', [('Subcatchment', 14), ('Flow Type', 10), ('Equation', 10)])
+    for s in groundwater_subcatchments:
+        lines.append(_row(['S{}'.format(s), 'LATERAL', '0.001*(Hgw-5)']))
+    lines.append('\n')
+
+    lines += _header('JUNCTIONS', [('Name', 14), ('Elevation', 10), ('MaxDepth', 10),
+                                    ('InitDepth', 10), ('SurDepth', 10), ('Aponded', 10)])
+    for k in range(n_outfalls, n_elements):
+        if k not in storage and k not in dividers:
+            lines.append(_row([names[k], inverts[k], round(rng.uniform(4, 15), 2), 0, 0, 0]))
+    lines.append('\n')
+
+    lines += _header('OUTFALLS', [('Name', 14), ('Elevation', 10), ('Type', 10),
+                                   ('Stage Data', 16), ('Gated', 8)])
+    for k in range(n_outfalls):
+        lines.append(_row([names[k], inverts[k], 'FREE', '', 'NO']))
+    lines.append('\n')
+
+    lines += _header('DIVIDERS', [('Name', 14), ('Elevation', 10), ('Diverted Link', 16),
+                                   ('Type', 10), ('Parameters', 10)])
+    for k in sorted(dividers):
+        lines.append(_row([names[k], inverts[k], 'D{}'.format(k), 'CUTOFF', 0.5, 10, 0, 0, 0]))
+    lines.append('\n')
+
+    lines += _header('STORAGE', [('Name', 14), ('Elev.', 8), ('MaxDepth', 10),
+                                  ('InitDepth', 10), ('Shape', 10), ('Curve Name', 16)])
+    for k in sorted(storage):
+        lines.append(_row([names[k], inverts[k], 10, 0, 'TABULAR', 'SC1', 0, 0]))
+    lines.append('\n')
+
+    # links are named after their upstream node
+    lines += _header('CONDUITS', [('Name', 14), ('From Node', 16), ('To Node', 16),
+                                   ('Length', 10), ('Roughness', 10), ('InOffset', 10),
+                                   ('OutOffset', 10), ('InitFlow', 10), ('MaxFlow', 10)])
+    for k, link_type in link_types.items():
+        if link_type == 'CONDUITS':
+            length = math.hypot(xs[k] - xs[parents[k]], ys[k] - ys[parents[k]])
+            lines.append(_row(['C{}'.format(k), names[k], names[parents[k]],
+                               round(length, 2), 0.013, 0, 0, 0, 0]))
+    for k, target in sorted(dividers.items()):
+        length = math.hypot(xs[k] - xs[target], ys[k] - ys[target])
+        lines.append(_row(['D{}'.format(k), names[k], names[target],
+                           round(max(length, 10), 2), 0.013, 0, 0, 0, 0]))
+    lines.append('\n')
+
+    lines += _header('PUMPS', [('Name', 14), ('From Node', 16), ('To Node', 16),
+                                ('Pump Curve', 16), ('Status', 8), ('Sartup', 8),
+                                ('Shutoff', 8)])
+    for k, link_type in link_types.items():
+        if link_type == 'PUMPS':
+            lines.append(_row(['C{}'.format(k), names[k], names[parents[k]],
+                               'PC1', 'ON', 0, 0]))
+    lines.append('\n')
+
+    lines += _header('ORIFICES', [('Name', 14), ('From Node', 16), ('To Node', 16),
+                                   ('Type', 12), ('Offset', 10), ('Qcoeff', 10),
+                                   ('Gated', 8), ('CloseTime', 10)])
+    for k, link_type in link_types.items():
+        if link_type == 'ORIFICES':
+            lines.append(_row(['C{}'.format(k), names[k], names[parents[k]],
+                               'SIDE', 0, 0.65, 'NO', 0]))
+    lines.append('\n')
+
+    lines += _header('WEIRS', [('Name', 14), ('From Node', 16), ('To Node', 16),
+                                ('Type', 12), ('CrestHt', 10), ('Qcoeff', 10),
+                                ('Gated', 8), ('EndCon', 8), ('EndCoeff', 10)])
+    for k, link_type in link_types.items():
+        if link_type == 'WEIRS':
+            lines.append(_row(['C{}'.format(k), names[k], names[parents[k]],
+                               'TRANSVERSE', 1, 3.33, 'NO', 0, 0]))
+    lines.append('\n')
+
+    lines += _header('OUTLETS', [('Name', 14), ('From Node', 16), ('To Node', 16),
+                                  ('Offset', 10), ('Type', 16), ('QTable/Qcoeff', 16),
+                                  ('Qexpon', 10), ('Gated', 8)])
+    for k, link_type in link_types.items():
+        if link_type == 'OUTLETS':
+            lines.append(_row(['C{}'.format(k), names[k], names[parents[k]],
+                               0, 'FUNCTIONAL/DEPTH', 10, 0.5, 'NO']))
+    lines.append('\n')
+
+    lines += _header('XSECTIONS', [('Link', 14), ('Shape', 12), ('Geom1', 16),
+                                    ('Geom2', 10), ('Geom3', 10), ('Geom4', 10),
+                                    ('Barrels', 10)])
+    for k, link_type in link_types.items():
+        if link_type == 'CONDUITS':
+            lines.append(_row(['C{}'.format(k), 'CIRCULAR', rng.choice([1, 1.5, 2, 3, 4]),
+                               0, 0, 0, 1]))
+        elif link_type in ('ORIFICES', 'WEIRS'):
+            lines.append(_row(['C{}'.format(k), 'RECT_CLOSED', 1, 2, 0, 0]))
+    for k in sorted(dividers):
+        lines.append(_row(['D{}'.format(k), 'CIRCULAR', 1, 0, 0, 0, 1]))
+    lines.append('\n')
+
+    lines += _header('LOSSES', [('Link', 14), ('Kentry', 10), ('Kexit', 10),
+                                 ('Kavg', 10), ('Flap Gate', 10), ('Seepage', 10)])
+    for k, link_type in link_types.items():
+        if link_type == 'CONDUITS' and rng.random() < 0.1:
+            lines.append(_row(['C{}'.format(k), 0.5, 0.5, 0, 'NO', 0]))
+    lines.append('\n')
+
+    lines += _header('POLLUTANTS', [('Name', 14), ('Units', 6), ('Crain', 10),
+                                     ('Cgw', 10), ('Crdii', 10), ('Kdecay', 10),
+                                     ('SnowOnly', 10), ('Co-Pollutant', 16), ('Co-Frac', 10),
+                                     ('Cdwf', 10), ('Cinit', 10)])
+    lines.append(_row(['TSS', 'MG/L', 0, 0, 0, 0, 'NO', '*', 0, 0, 0]))
+    lines.append('\n')
+
+    lines += _header('LANDUSES', [('Name', 14), ('Sweeping Interval', 10),
+                                   ('Fraction Available', 10), ('Last Swept', 10)])
+    lines.append(_row(['Residential', 0, 0, 0]))
+    lines.append(_row(['Commercial', 0, 0, 0]))
+    lines.append('\n')
+
+    lines += _header('COVERAGES', [('Subcatchment', 14), ('Land Use', 16), ('Percent', 10)])
+    for s in range(len(outlets)):
+        residential = rng.randint(0, 100)
+        lines.append(_row(['S{}'.format(s), 'Residential', residential]))
+        if residential < 100:
+            lines.append(_row(['S{}'.format(s), 'Commercial', 100 - residential]))
+    lines.append('\n')
+
+    lines += _header('LOADINGS', [('Subcatchment', 14), ('Pollutant', 16), ('Buildup', 10)])
+    for s in range(len(outlets)):
+        if rng.random() < 0.1:
+            lines.append(_row(['S{}'.format(s), 'TSS', round(rng.uniform(0.1, 2), 3)]))
+    lines.append('\n')
+
+    lines += _header('BUILDUP', [('Land Use', 14), ('Pollutant', 16), ('Function', 10),
+                                  ('Coeff1', 10), ('Coeff2', 10), ('Coeff3', 10),
+                                  ('Per Unit', 10)])
+    lines.append(_row(['Residential', 'TSS', 'POW', 10, 0.5, 2, 'AREA']))
+    lines.append(_row(['Commercial', 'TSS', 'POW', 20, 0.5, 2, 'AREA']))
+    lines.append('\n')
+
+    lines += _header('WASHOFF', [('Land Use', 14), ('Pollutant', 16), ('Function', 10),
+                                  ('Coeff1', 10), ('Coeff2', 10), ('SweepRmvl', 10),
+                                  ('BmpRmvl', 10)])
+    lines.append(_row(['Residential', 'TSS', 'EXP', 0.1, 1, 0, 0]))
+    lines.append(_row(['Commercial', 'TSS', 'EXP', 0.1, 1, 0, 0]))
+    lines.append('\n')
+
+    lines += _header('TREATMENT', [('Node', 14), ('Pollutant', 16), ('Function', 10)])
+    for k in sorted(storage):
+        lines.append(_row([names[k], 'TSS', 'R = 0.5']))
+    lines.append('\n')
+
+    lines += _header('INFLOWS', [('Node', 14), ('Constituent', 16), ('Time Series', 16),
+                                  ('Type', 8), ('Mfactor', 8), ('Sfactor', 8)])
+    for k in range(n_outfalls, n_elements):
+        if rng.random() < 0.05:
+            lines.append(_row([names[k], 'FLOW', 'TS1', 'FLOW', 1.0, 1.0]))
+    lines.append('\n')
+
+    lines += _header('DWF', [('Node', 14), ('Constituent', 16), ('Baseline', 10),
+                              ('Patterns', 10)])
+    for k in range(n_outfalls, n_elements):
+        if rng.random() < 0.1:
+            lines.append(_row([names[k], 'FLOW', round(rng.uniform(0.01, 1), 3), '"DP1"']))
+    lines.append('\n')
+
+    lines += _header('RDII', [('Node', 14), ('Unit Hydrograph', 16), ('Sewer Area', 10)])
+    for k in range(n_outfalls, n_elements):
+        if rng.random() < 0.05:
+            lines.append(_row([names[k], 'UH1', round(rng.uniform(1, 50), 2)]))
+    lines.append('\n')
+
+    lines += _header('HYDROGRAPHS', [('Hydrograph', 14), ('Rain Gage/Month', 16),
+                                      ('Response', 10), ('R', 10), ('T', 10), ('K', 10)])
+    lines.append(_row(['UH1', 'RG1']))
+    lines.append(_row(['UH1', 'All', 'Short', 0.05, 1, 2]))
+    lines.append(_row(['UH1', 'All', 'Medium', 0.03, 3, 2]))
+    lines.append(_row(['UH1', 'All', 'Long', 0.01, 10, 2]))
+    lines.append('\n')
+
+    lines += _header('CURVES', [('Name', 14), ('Type', 10), ('X-Value', 10),
+                                 ('Y-Value', 10)])
+    lines.append(_row(['SC1', 'Storage', 0, 1000]))
+    lines.append(_row(['SC1', '', 10, 5000]))
+    lines.append(_row(['PC1', 'Pump1', 0, 1]))
+    lines.append(_row(['PC1', '', 100, 2]))
+    lines.append('\n')
+
+    lines += _header('TIMESERIES', [('Name', 14), ('Date', 10), ('Time', 10),
+                                     ('Value', 10)])
+    for hour in range(24):
+        lines.append(_row(['TS1', '', '{}:00'.format(hour),
+                           round(max(0, math.sin(hour / 24 * math.pi)), 3)]))
+    lines.append('\n')
+
+    lines += _header('PATTERNS', [('Name', 14), ('Type', 10), ('Multipliers', 10)])
+    lines.append(_row(['DP1', 'DAILY', 1, 1, 1, 1, 1, 1, 1]))
+    lines.append('\n')
+
+    lines += ['[REPORT]\n',
+              ';;Reporting Options\n',
+              'INPUT      NO\n',
+              'CONTROLS   NO\n',
+              'SUBCATCHMENTS ALL\n',
+              'NODES ALL\n',
+              'LINKS ALL\n',
+              '\n']
+
+    lines += _header('TAGS', [('Type', 14), ('Name', 16), ('Tag', 10)])
+    for k in range(n_outfalls, n_elements):
+        if rng.random() < 0.02:
+            lines.append(_row(['Node', names[k], 'Inspected']))
+            lines.append(_row(['Link', 'C{}'.format(k), 'Inspected']))
+    lines.append('\n')
+
+    lines += ['[MAP]\n',
+              'DIMENSIONS {} {} {} {}\n'.format(round(min(xs), 3), round(min(ys), 3),
+                                               round(max(xs), 3), round(max(ys), 3)),
+              'Units      Feet\n',
+              '\n']
+
+    lines += _header('COORDINATES', [('Node', 14), ('X-Coord', 18), ('Y-Coord', 18)])
+    for k in range(n_elements):
+        lines.append(_row([names[k], round(xs[k], 3), round(ys[k], 3)], 18))
+    lines.append('\n')
+
+    lines += _header('VERTICES', [('Link', 14), ('X-Coord', 18), ('Y-Coord', 18)])
+    for k, link_type in link_types.items():
+        if link_type == 'CONDUITS' and rng.random() < 0.3:
+            p = parents[k]
+            for v in range(rng.randint(1, 3)):
+                t = (v + 1) / 4.0
+                x = xs[k] + t * (xs[p] - xs[k]) + rng.uniform(-10, 10)
+                y = ys[k] + t * (ys[p] - ys[k]) + rng.uniform(-10, 10)
+                lines.append(_row(['C{}'.format(k), round(x, 3), round(y, 3)], 18))
+    lines.append('\n')
+
+    # subcatchment polygons are irregular shapes around their outlet
+    lines += _header('POLYGONS', [('Subcatchment', 14), ('X-Coord', 18), ('Y-Coord', 18)])
+    for s, outlet in enumerate(outlets):
+        n_sides = rng.randint(4, 6)
+        for v in range(n_sides):
+            angle = 2 * math.pi * v / n_sides
+            radius = rng.uniform(50, 150)
+            x = xs[outlet] + radius * math.cos(angle)
+            y = ys[outlet] + radius * math.sin(angle)
+            lines.append(_row(['S{}'.format(s), round(x, 3), round(y, 3)], 18))
+    lines.append('\n')
+
+    lines += ['[SYMBOLS]\n',
+              ';;Gage           X-Coord            Y-Coord\n',
+              ';;-------------- ------------------ ------------------\n',
+              _row(['RG1', round(side / 2, 3), round(side / 2, 3)], 18)]
+
+    return lines
+
+def write_model(path, n_elements, seed=0):
+    '''
+    Writes a synthetic SWMM .inp file
+
+    Parameters
+    ----------
+    path: str
+        the path of the .inp file
+    n_elements: int
+        the number of nodes in the model
+    seed: int
+        the seed of the random number generator
+
+    Returns
+    -------
+    Path
+        the path of the .inp file
+    '''
+
+    path = Path(path)
+    with open(path, 'w') as out_file:
+        out_file.writelines(generate_model(n_elements, seed))
+    return path
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate a synthetic SWMM .inp file')
+    parser.add_argument('path', help='the .inp file to write')
+    parser.add_argument('-n', '--elements', type=int, default=1000,
+                        help='the number of nodes in the model')
+    parser.add_argument('-s', '--seed', type=int, default=0,
+                        help='the seed of the random number generator')
+    args = parser.parse_args()
+
+    write_model(args.path, args.elements, args.seed)
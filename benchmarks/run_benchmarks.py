@@ -0,0 +1,275 @@
+'''
+Benchmarks the reading and writing of SWMM .inp files
+
+Synthetic models of each requested size are generated with generate_model
+and the following are timed:
+- open: SWMMProject on the .inp file
+- write: SWMMProject.write_to_file
+- round_trip: open followed by write
+- options_parse: Options.read_params on the OPTIONS section
+- files_parse: Files.read_params on the FILES section
+
+The peak memory used while opening each model is also recorded. Results are
+saved as JSON, and can be compared against an earlier results file to spot
+regressions between releases.
+'''
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / 'swools'))
+
+from swmm_project import SWMMProject
+from objects.sim_options import Options
+from objects.interface_files import Files
+from generate_model import write_model
+
+# GLOBAL VARIABLES
+
+# how much slower a benchmark can be than the baseline before it is flagged
+REGRESSION_THRESHOLD = 1.1
+
+# FUNCTIONS
+def _time(func, repeat):
+    '''
+    Times a function
+
+    Parameters
+    ----------
+    func: function
+        the function to time, called without arguments
+    repeat: int
+        the number of times to call the function
+
+    Returns
+    -------
+    dict
+        the min, median and max time in seconds
+    '''
+
+    times = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {'min_s': min(times),
+            'median_s': statistics.median(times),
+            'max_s': max(times),
+            'repeat': repeat}
+
+def _open_project(inp_path):
+    '''
+    Opens a SWMMProject, hiding the messages about unrecorded sections
+    '''
+    with contextlib.redirect_stdout(io.StringIO()):
+        return SWMMProject(inp_path)
+
+def _section_lines(inp_path, section):
+    '''
+    Returns the lines of a section of a .inp file, without the header
+    '''
+    lines = []
+    with open(inp_path, 'r') as inp_file:
+        for line in inp_file:
+            if line.strip() == '[{}]'.format(section):
+                for line in inp_file:
+                    lines.append(line)
+                    if line == '\n':
+                        break
+                break
+    return lines
+
+def _peak_memory(func):
+    '''
+    Returns the peak memory allocated by a function in bytes
+    '''
+    tracemalloc.start()
+    try:
+        func()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+def run_size(n_elements, seed, repeat, work_dir):
+    '''
+    Runs every benchmark on a model of one size
+
+    Parameters
+    ----------
+    n_elements: int
+        the number of nodes in the model
+    seed: int
+        the seed used to generate the model
+    repeat: int
+        the number of times each benchmark is run
+    work_dir: Path
+        the folder to write the models to
+
+    Returns
+    -------
+    dict
+        the results of each benchmark
+    '''
+
+    inp_path = write_model(work_dir / 'model_{}.inp'.format(n_elements), n_elements, seed)
+    out_name = 'out_{}.inp'.format(n_elements)
+    project = _open_project(inp_path)
+
+    options_lines = _section_lines(inp_path, 'OPTIONS')
+    files_lines = _section_lines(inp_path, 'FILES')
+
+    # the section readers are fast, so they are run in batches to get a
+    # measurable time
+    batch = 100
+
+    def parse_options():
+        for i in range(batch):
+            Options().read_params(iter(options_lines))
+
+    def parse_files():
+        for i in range(batch):
+            Files().read_params(iter(files_lines))
+
+    def round_trip():
+        _open_project(inp_path).write_to_file(out_name, work_dir)
+
+    benchmarks = {'open': _time(lambda: _open_project(inp_path), repeat),
+                  'write': _time(lambda: project.write_to_file(out_name, work_dir), repeat),
+                  'round_trip': _time(round_trip, repeat),
+                  'options_parse': _time(parse_options, repeat),
+                  'files_parse': _time(parse_files, repeat)}
+
+    for name in ('options_parse', 'files_parse'):
+        for k in ('min_s', 'median_s', 'max_s'):
+            benchmarks[name][k] /= batch
+
+    return {'elements': n_elements,
+            'seed': seed,
+            'file_bytes': inp_path.stat().st_size,
+            'peak_memory_open_bytes': _peak_memory(lambda: _open_project(inp_path)),
+            'benchmarks': benchmarks}
+
+def _git_commit():
+    '''
+    Returns the current git commit, or None outside of a git repository
+    '''
+    try:
+        result = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=str(BENCH_DIR),
+                                capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+def run(sizes, seed=0, repeat=3):
+    '''
+    Runs the benchmarks on models of each size
+
+    Parameters
+    ----------
+    sizes: list of int
+        the number of nodes in each model
+    seed: int
+        the seed used to generate the models
+    repeat: int
+        the number of times each benchmark is run
+
+    Returns
+    -------
+    dict
+        the results along with details of the environment they were run in
+    '''
+
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for n_elements in sizes:
+            results.append(run_size(n_elements, seed, repeat, Path(work_dir)))
+
+    return {'timestamp': datetime.now(timezone.utc).isoformat(),
+            'git_commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'results': results}
+
+def compare(current, baseline):
+    '''
+    Compares results against a baseline
+
+    Parameters
+    ----------
+    current: dict
+        results returned by run
+    baseline: dict
+        earlier results returned by run
+
+    Returns
+    -------
+    list of str
+        a line for each benchmark found in both, marking regressions
+    '''
+
+    baseline_results = {r['elements']: r for r in baseline['results']}
+
+    lines = []
+    for result in current['results']:
+        base = baseline_results.get(result['elements'])
+        if base is None:
+            continue
+
+        # the fastest run is the least affected by other load on the machine
+        pairs = [(name, b['min_s'], base['benchmarks'][name]['min_s'])
+                 for name, b in result['benchmarks'].items()
+                 if name in base['benchmarks']]
+        pairs.append(('peak_memory_open', result['peak_memory_open_bytes'],
+                      base['peak_memory_open_bytes']))
+
+        for name, new, old in pairs:
+            ratio = new / old if old else float('inf')
+            flag = '  REGRESSION' if ratio > REGRESSION_THRESHOLD else ''
+            lines.append('{:>9} {:<18} {:>8.2f}x{}'.format(result['elements'], name,
+                                                           ratio, flag))
+    return lines
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark swools on synthetic SWMM models')
+    parser.add_argument('-n', '--sizes', type=int, nargs='+', default=[1000, 10000],
+                        help='the number of nodes in each model, from 1000 to 1000000')
+    parser.add_argument('-s', '--seed', type=int, default=0,
+                        help='the seed used to generate the models')
+    parser.add_argument('-r', '--repeat', type=int, default=3,
+                        help='the number of times each benchmark is run')
+    parser.add_argument('-o', '--output', default='bench_results.json',
+                        help='the JSON file to save the results to')
+    parser.add_argument('-c', '--compare', default=None,
+                        help='an earlier JSON results file to compare against')
+    args = parser.parse_args()
+
+    current = run(args.sizes, args.seed, args.repeat)
+    with open(args.output, 'w') as out_file:
+        json.dump(current, out_file, indent=2)
+
+    for result in current['results']:
+        for name, b in result['benchmarks'].items():
+            print('{:>9} {:<18} {:>12.6f} s'.format(result['elements'], name, b['median_s']))
+        print('{:>9} {:<18} {:>12.1f} MB'.format(result['elements'], 'peak_memory_open',
+                                                 result['peak_memory_open_bytes'] / 1e6))
+
+    if args.compare is not None:
+        with open(args.compare, 'r') as baseline_file:
+            baseline = json.load(baseline_file)
+        print()
+        print('Compared with {}'.format(args.compare))
+        for line in compare(current, baseline):
+            print(line)
@@ -0,0 +1,431 @@
+'''
+A catalog of SWMM .inp files stored in a local SQLite database
+
+The catalog records the OPTIONS parameters, the FILES interface files and the
+number of rows in each section of every model it indexes, so questions across
+a whole portfolio of models can be answered without opening any .inp file.
+Models are only parsed again when their modification time and contents have
+changed since they were last indexed.
+'''
+
+import hashlib
+import os
+import re
+import sqlite3
+import time
+from pathlib import Path, PurePosixPath, PureWindowsPath
+
+from objects.sim_options import Options
+from objects.interface_files import FILE_TYPES
+
+# GLOBAL VARIABLES
+
+# the Options attributes and the options table columns they are stored in.
+# the columns are named after the SWMM keys where the attribute is not
+OPTION_COLUMNS = {attr: attr for attr in vars(Options())}
+OPTION_COLUMNS['intertial_damping'] = 'inertial_damping'
+
+# tables made by an older version of the catalog are rebuilt
+SCHEMA_VERSION = 3
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS models (
+    model_id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    indexed_at REAL NOT NULL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS options (
+    model_id INTEGER PRIMARY KEY REFERENCES models ON DELETE CASCADE,
+    {}
+);
+CREATE TABLE IF NOT EXISTS extra_options (
+    model_id INTEGER NOT NULL REFERENCES models ON DELETE CASCADE,
+    param TEXT NOT NULL,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS interface_files (
+    model_id INTEGER NOT NULL REFERENCES models ON DELETE CASCADE,
+    mode TEXT NOT NULL,
+    type TEXT NOT NULL,
+    path TEXT NOT NULL,
+    name TEXT NOT NULL,
+    directory TEXT NOT NULL,
+    directory_key TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sections (
+    model_id INTEGER NOT NULL REFERENCES models ON DELETE CASCADE,
+    section TEXT NOT NULL,
+    row_count INTEGER NOT NULL,
+    PRIMARY KEY (model_id, section)
+);
+CREATE INDEX IF NOT EXISTS options_flow_routing ON options (flow_routing);
+CREATE INDEX IF NOT EXISTS extra_options_model ON extra_options (model_id);
+CREATE INDEX IF NOT EXISTS extra_options_param ON extra_options (param);
+CREATE INDEX IF NOT EXISTS interface_files_model ON interface_files (model_id);
+CREATE INDEX IF NOT EXISTS interface_files_directory ON interface_files (directory_key, type, mode);
+CREATE INDEX IF NOT EXISTS sections_section ON sections (section, row_count);
+'''.format(',\n    '.join(OPTION_COLUMNS.values()))
+
+TABLES = ['sections', 'interface_files', 'extra_options', 'options', 'models']
+
+# FUNCTIONS
+def _pure_path(path):
+    '''
+    Returns a path as a PurePath of the right flavour
+
+    SWMM models are often written on Windows, so paths with backslashes or a
+    drive letter are treated as Windows paths whatever the current platform
+
+    Parameters
+    ----------
+    path: str
+        the path
+
+    Returns
+    -------
+    PureWindowsPath or PurePosixPath
+    '''
+
+    path = str(path)
+    if '\\' in path or (len(path) > 1 and path[1] == ':'):
+        return PureWindowsPath(path)
+    else:
+        return PurePosixPath(path)
+
+def _normalise_path(path, base_dir=None):
+    '''
+    Returns a path as a string in a consistent form
+
+    Parameters
+    ----------
+    path: str
+        the path to normalise
+    base_dir: str
+        the folder relative paths are resolved against, the current folder
+        if not given
+
+    Returns
+    -------
+    str
+        the normalised path
+    '''
+
+    pure = _pure_path(path)
+    if pure.is_absolute():
+        return str(pure)
+
+    # a relative Windows path written in a model is read in the style of
+    # the current platform
+    if base_dir is None:
+        base_dir = os.getcwd()
+    return os.path.normpath(os.path.join(str(base_dir), *pure.parts))
+
+def _directory_key(directory):
+    '''
+    Returns the form of a directory used to look up interface files
+
+    Windows paths are not case sensitive, so they are case folded
+
+    Parameters
+    ----------
+    directory: str
+        a normalised directory
+
+    Returns
+    -------
+    str
+        the lookup key
+    '''
+
+    if isinstance(_pure_path(directory), PureWindowsPath):
+        return directory.casefold()
+    else:
+        return directory
+
+def _scan_inp(text):
+    '''
+    Reads the OPTIONS and FILES sections and counts the rows of every section
+    of a .inp file
+
+    Each OPTIONS row is read on its own, so a row the Options class does not
+    understand is set aside rather than losing the rest of the model. FILES
+    rows are split here, taking the quoted path if there is one and the
+    third word otherwise, since SWMM accepts paths without quotes
+
+    Parameters
+    ----------
+    text: str
+        the contents of the .inp file
+
+    Returns
+    -------
+    tuple
+        the Options, a list of (mode, type, path), a dictionary of section
+        row counts, a list of (param, value) for the OPTIONS rows that could
+        not be read and a list of error messages for the rows that could not
+        be parsed
+    '''
+
+    options = Options()
+    interface_files = []
+    row_counts = {}
+    extra_options = []
+    errors = []
+
+    section = None
+    for line in text.splitlines(True):
+        stripped = line.strip()
+        if stripped.startswith('[') and stripped.endswith(']'):
+            section = stripped[1:-1].upper()
+            row_counts.setdefault(section, 0)
+        elif section is not None and stripped != '' and not stripped.startswith(';'):
+            row_counts[section] += 1
+
+            # the OPTIONS reader skips the two column header lines and stops
+            # at a blank line
+            if section == 'OPTIONS':
+                try:
+                    options.read_params(iter(['\n', '\n', line, '\n']))
+                except Exception:
+                    temp = stripped.split(None, 1)
+                    extra_options.append((temp[0], temp[1] if len(temp) > 1 else None))
+            elif section == 'FILES':
+                temp = stripped.split()
+                quoted = re.search(r'"([^"]*)"', stripped)
+                if len(temp) < 3 or temp[0].upper() not in ('SAVE', 'USE') \
+                        or temp[1].upper() not in FILE_TYPES:
+                    errors.append('FILES {!r}: expected SAVE or USE, a file type '
+                                  'and a path'.format(stripped))
+                else:
+                    interface_files.append((temp[0].upper(), temp[1].upper(),
+                                            quoted.group(1) if quoted else temp[2]))
+
+    return options, interface_files, row_counts, extra_options, errors
+
+# CORE CLASS
+class Catalog(object):
+    '''
+    A SQLite catalog of parsed SWMM .inp files
+
+    The tables can be queried directly through the connection, for example
+
+        SELECT path FROM models JOIN options USING (model_id)
+        WHERE flow_routing = 'DYNWAVE' AND threads > 1
+
+    Tables
+    ------
+    models
+        path, mtime_ns, size, sha256, indexed_at and error of each model
+    options
+        one column per Options attribute, named after the SWMM key
+    extra_options
+        param and value of each OPTIONS row the Options class does not know
+    interface_files
+        mode (SAVE or USE), type, path, name and directory of each FILES row.
+        Relative paths are resolved against the folder of the model.
+        directory_key is the directory case folded for Windows paths
+    sections
+        section and row_count of each section in each model
+    '''
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.connection = sqlite3.connect(str(db_path))
+        self.connection.execute('PRAGMA foreign_keys = ON')
+
+        version = self.connection.execute('PRAGMA user_version').fetchone()[0]
+        if version != SCHEMA_VERSION:
+            with self.connection:
+                for table in TABLES:
+                    self.connection.execute('DROP TABLE IF EXISTS {}'.format(table))
+            self.connection.execute('PRAGMA user_version = {}'.format(SCHEMA_VERSION))
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        '''
+        Closes the connection to the database
+        '''
+        self.connection.close()
+
+    def index(self, paths):
+        '''
+        Indexes .inp files, skipping those that have not changed since they
+        were last indexed
+
+        A file is skipped when its modification time and size are the same
+        as when it was indexed. Otherwise it is hashed, and only parsed
+        again if the hash has changed
+
+        Parameters
+        ----------
+        paths: str, Path or list
+            a directory, which is searched recursively for .inp files, a
+            single .inp file or a list of .inp files
+
+        Returns
+        -------
+        int
+            the number of files that were parsed
+        '''
+
+        if isinstance(paths, (str, Path)):
+            if Path(paths).is_dir():
+                paths = sorted(Path(paths).rglob('*.inp'))
+            else:
+                paths = [paths]
+
+        cursor = self.connection.cursor()
+        n_parsed = 0
+        with self.connection:
+            for path in paths:
+                path = Path(path).resolve()
+                stat = path.stat()
+                row = cursor.execute('SELECT model_id, mtime_ns, size, sha256 FROM models WHERE path = ?',
+                                     (str(path),)).fetchone()
+                if row is not None and row[1] == stat.st_mtime_ns and row[2] == stat.st_size:
+                    continue
+
+                data = path.read_bytes()
+                sha256 = hashlib.sha256(data).hexdigest()
+                if row is not None and row[3] == sha256:
+                    cursor.execute('UPDATE models SET mtime_ns = ?, size = ? WHERE model_id = ?',
+                                   (stat.st_mtime_ns, stat.st_size, row[0]))
+                    continue
+
+                self._index_model(cursor, path, stat, sha256, data)
+                n_parsed += 1
+
+        return n_parsed
+
+    def _index_model(self, cursor, path, stat, sha256, data):
+        '''
+        Replaces the records of a single model
+        '''
+
+        cursor.execute('DELETE FROM models WHERE path = ?', (str(path),))
+
+        # rows that cannot be read are recorded, along with the reason, so
+        # the model is not parsed again until it changes
+        options, interface_files, row_counts, extra_options, errors = \
+            _scan_inp(data.decode('utf-8', errors='replace'))
+        error = '; '.join(errors) if errors else None
+
+        cursor.execute('INSERT INTO models (path, mtime_ns, size, sha256, indexed_at, error) '
+                       'VALUES (?, ?, ?, ?, ?, ?)',
+                       (str(path), stat.st_mtime_ns, stat.st_size, sha256, time.time(), error))
+        model_id = cursor.lastrowid
+
+        cursor.execute('INSERT INTO options (model_id, {}) VALUES (?{})'.format(
+                           ', '.join(OPTION_COLUMNS.values()), ', ?' * len(OPTION_COLUMNS)),
+                       [model_id] + [getattr(options, a) for a in OPTION_COLUMNS])
+
+        cursor.executemany('INSERT INTO extra_options (model_id, param, value) VALUES (?, ?, ?)',
+                           [(model_id, p, v) for p, v in extra_options])
+
+        file_rows = []
+        for mode, file_type, file_path in interface_files:
+            file_path = _normalise_path(file_path, path.parent)
+            pure = _pure_path(file_path)
+            directory = str(pure.parent)
+            file_rows.append((model_id, mode, file_type, file_path, pure.name, directory,
+                              _directory_key(directory)))
+        cursor.executemany('INSERT INTO interface_files '
+                           '(model_id, mode, type, path, name, directory, directory_key) '
+                           'VALUES (?, ?, ?, ?, ?, ?, ?)', file_rows)
+
+        cursor.executemany('INSERT INTO sections (model_id, section, row_count) VALUES (?, ?, ?)',
+                           [(model_id, k, v) for k, v in row_counts.items()])
+
+    def prune(self):
+        '''
+        Removes the models whose files no longer exist
+
+        Returns
+        -------
+        int
+            the number of models removed
+        '''
+
+        rows = self.connection.execute('SELECT model_id, path FROM models').fetchall()
+        missing = [(model_id,) for model_id, path in rows if not os.path.exists(path)]
+        with self.connection:
+            self.connection.executemany('DELETE FROM models WHERE model_id = ?', missing)
+        return len(missing)
+
+    def find_models(self, where='1', params=()):
+        '''
+        Returns the models whose options match a condition
+
+        Parameters
+        ----------
+        where: str
+            an SQL condition on the columns of the models and options tables,
+            for example "flow_routing = 'DYNWAVE' AND threads > ?"
+        params: tuple
+            the values for any placeholders in the condition
+
+        Returns
+        -------
+        list of str
+            the paths of the matching models
+        '''
+
+        sql = ('SELECT path FROM models JOIN options USING (model_id) '
+               'WHERE {} ORDER BY path'.format(where))
+        return [r[0] for r in self.connection.execute(sql, params)]
+
+    def find_interface_file_users(self, directory, file_type=None, mode=None):
+        '''
+        Returns the models with an interface file in a directory
+
+        Parameters
+        ----------
+        directory: str
+            the directory holding the interface files, relative paths are
+            resolved against the current folder. Windows directories are
+            matched whatever their case
+        file_type: str
+            only include interface files of this type, e.g. HOTSTART
+        mode: str
+            only include interface files that are SAVEd or USEd
+
+        Returns
+        -------
+        list of str
+            the paths of the matching models
+        '''
+
+        sql = ('SELECT DISTINCT m.path FROM models m JOIN interface_files f USING (model_id) '
+               'WHERE f.directory_key = ?')
+        params = [_directory_key(_normalise_path(directory))]
+        if file_type is not None:
+            sql += ' AND f.type = ?'
+            params.append(file_type.upper())
+        if mode is not None:
+            sql += ' AND f.mode = ?'
+            params.append(mode.upper())
+        sql += ' ORDER BY m.path'
+        return [r[0] for r in self.connection.execute(sql, params)]
+
+    def section_counts(self, path):
+        '''
+        Returns the number of rows in each section of a model
+
+        Parameters
+        ----------
+        path: str
+            the path to the .inp file
+
+        Returns
+        -------
+        dict
+            the row count of each section
+        '''
+
+        sql = ('SELECT section, row_count FROM sections JOIN models USING (model_id) '
+               'WHERE path = ?')
+        return dict(self.connection.execute(sql, (str(Path(path).resolve()),)))
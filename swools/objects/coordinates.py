@@ -0,0 +1,306 @@
+'''
+These classes are to read and write the COORDINATES, VERTICES and POLYGONS
+portions of the SWMM .inp file
+'''
+
+from array import array
+
+from .spatial_index import KDTree, point_in_polygon
+
+# EXCEPTIONS
+class ElementNotFoundError(Exception):
+    '''
+    An exception for when an element has no points in the section
+    '''
+    pass
+
+# CORE CLASSES
+class _PointSection(object):
+    '''
+    A section of the SWMM .inp file made up of named x, y points
+
+    The points are stored as parallel arrays of names, x coordinates and
+    y coordinates. A spatial index is built over the arrays the first time
+    a spatial query is made and is thrown away whenever the points change,
+    so the arrays should only be changed through the methods of the class
+    '''
+
+    section = None
+    header = None
+
+    def __init__(self):
+        self.names = []
+        self.x = array('d')
+        self.y = array('d')
+        self._index = None
+
+    def __str__(self):
+        s = '[{}]\n'.format(self.section)
+        s += self.header
+        for name, x, y in zip(self.names, self.x, self.y):
+            s += name.ljust(16) + ' '
+            s += str(x).ljust(18) + ' '
+            s += str(y)
+            s += '\n'
+        return s
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def has_reached_section(cls, line):
+        '''
+        Determines if the section has been reached when reading the .inp file
+
+        Parameters
+        ----------
+        line : str
+            current line from the .inp file
+
+        Returns
+        -------
+        bool
+            True if the section header, else False
+        '''
+        if line.strip() == '[{}]'.format(cls.section):
+            return True
+        else:
+            return False
+
+    def read_params(self, inp_file):
+        '''
+        Reads the points from the .inp file and records them in the arrays
+
+        Parameters
+        ----------
+        inp_file : input file
+            the SWMM .inp file
+
+        Returns
+        -------
+        str
+            the line after the last param
+        '''
+
+        # the cutoff to stop reading the params is a new line. comment lines,
+        # including the column headers, are skipped
+        line = ''
+        for line in inp_file:
+            if line.strip() == '':
+                break
+            elif line.startswith(';'):
+                continue
+            else:
+                temp = line.split()
+                self.names.append(temp[0])
+                self.x.append(float(temp[1]))
+                self.y.append(float(temp[2]))
+        else:
+            # the section was the last one in the file
+            line = ''
+
+        self._index = None
+        return line
+
+    @property
+    def index(self):
+        '''
+        The spatial index over the points, built on first use
+        '''
+        if self._index is None:
+            self._index = KDTree(self.x, self.y)
+        return self._index
+
+    def add_point(self, name, x, y):
+        '''
+        Adds a point to the section
+
+        Parameters
+        ----------
+        name: str
+            The name of the element the point belongs to
+        x: float
+            The x coordinate
+        y: float
+            The y coordinate
+
+        Returns
+        -------
+        None
+        '''
+
+        self.names.append(name)
+        self.x.append(float(x))
+        self.y.append(float(y))
+        self._index = None
+
+    def remove_element(self, name):
+        '''
+        Removes every point belonging to an element
+
+        Parameters
+        ----------
+        name: str
+            The name of the element
+
+        Returns
+        -------
+        None
+        '''
+
+        keep = [i for i, n in enumerate(self.names) if n != name]
+        if len(keep) == len(self.names):
+            raise ElementNotFoundError('{} was not found in [{}]'.format(name, self.section))
+
+        self.names = [self.names[i] for i in keep]
+        self.x = array('d', (self.x[i] for i in keep))
+        self.y = array('d', (self.y[i] for i in keep))
+        self._index = None
+
+    def return_points(self, name):
+        '''
+        Returns the points belonging to an element
+
+        Parameters
+        ----------
+        name: str
+            The name of the element
+
+        Returns
+        -------
+        list of tuple
+            The (x, y) points of the element, in file order
+        '''
+
+        points = [(self.x[i], self.y[i])
+                  for i, n in enumerate(self.names) if n == name]
+        if len(points) == 0:
+            raise ElementNotFoundError('{} was not found in [{}]'.format(name, self.section))
+        return points
+
+    def _unique_names(self, indices):
+        '''
+        Returns the element names of a list of point indices without
+        duplicates, in file order
+        '''
+        found = {}
+        for i in sorted(indices):
+            found[self.names[i]] = None
+        return list(found)
+
+    def in_bbox(self, x_min, y_min, x_max, y_max):
+        '''
+        Returns the elements with a point inside a bounding box
+
+        Parameters
+        ----------
+        x_min, y_min, x_max, y_max : float
+            the bounds of the box, inclusive
+
+        Returns
+        -------
+        list of str
+            the names of the elements
+        '''
+
+        return self._unique_names(self.index.query_bbox(x_min, y_min, x_max, y_max))
+
+    def in_polygon(self, polygon):
+        '''
+        Returns the elements with a point inside a polygon
+
+        Parameters
+        ----------
+        polygon : list of tuple
+            the (x, y) vertices of the polygon, in order. The points of a
+            subcatchment can be retrieved with Polygons.return_points
+
+        Returns
+        -------
+        list of str
+            the names of the elements
+        '''
+
+        # narrow the search to the bounding box of the polygon first
+        xs = [p[0] for p in polygon]
+        ys = [p[1] for p in polygon]
+        candidates = self.index.query_bbox(min(xs), min(ys), max(xs), max(ys))
+        inside = [i for i in candidates
+                  if point_in_polygon(self.x[i], self.y[i], polygon)]
+        return self._unique_names(inside)
+
+    def nearest(self, x, y):
+        '''
+        Returns the element with the point nearest to a coordinate
+
+        Parameters
+        ----------
+        x : float
+            x coordinate
+        y : float
+            y coordinate
+
+        Returns
+        -------
+        str or None
+            the name of the element, None if the section is empty
+        '''
+
+        i = self.index.nearest(x, y)
+        if i is None:
+            return None
+        return self.names[i]
+
+class Coordinates(_PointSection):
+    '''
+    The COORDINATES class from the SWMM .inp file
+    '''
+
+    section = 'COORDINATES'
+    header = (';;Node           X-Coord            Y-Coord           \n'
+              ';;-------------- ------------------ ------------------\n')
+
+    def set_point(self, name, x, y):
+        '''
+        Moves a node to a new location
+
+        Parameters
+        ----------
+        name: str
+            The name of the node
+        x: float
+            The new x coordinate
+        y: float
+            The new y coordinate
+
+        Returns
+        -------
+        None
+        '''
+
+        try:
+            i = self.names.index(name)
+        except ValueError:
+            raise ElementNotFoundError('{} was not found in [{}]'.format(name, self.section))
+
+        self.x[i] = float(x)
+        self.y[i] = float(y)
+        self._index = None
+
+class Vertices(_PointSection):
+    '''
+    The VERTICES class from the SWMM .inp file
+    '''
+
+    section = 'VERTICES'
+    header = (';;Link           X-Coord            Y-Coord           \n'
+              ';;-------------- ------------------ ------------------\n')
+
+class Polygons(_PointSection):
+    '''
+    The POLYGONS class from the SWMM .inp file
+    '''
+
+    section = 'POLYGONS'
+    header = (';;Subcatchment   X-Coord            Y-Coord           \n'
+              ';;-------------- ------------------ ------------------\n')
@@ -2,7 +2,7 @@
 This class is to read and write the OPTIONS portion of the SWMM .inp file
 '''
 
-from swool_utilities import flt_int
+from .swool_utilities import flt_int
 
 class Options(object):
     '''
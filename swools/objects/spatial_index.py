@@ -0,0 +1,212 @@
+'''
+A k-d tree spatial index used by the coordinate based sections of the
+SWMM .inp file (COORDINATES, VERTICES and POLYGONS)
+'''
+
+import heapq
+import math
+
+# the largest number of points held in a leaf of the tree
+LEAF_SIZE = 16
+
+# FUNCTIONS
+def point_in_polygon(x, y, polygon):
+    '''
+    Determines if a point falls inside a polygon using ray casting
+
+    Parameters
+    ----------
+    x : float
+        x coordinate of the point
+    y : float
+        y coordinate of the point
+    polygon : list of tuple
+        the (x, y) vertices of the polygon, in order
+
+    Returns
+    -------
+    bool
+        True if the point is inside the polygon, else False
+    '''
+
+    inside = False
+    n = len(polygon)
+    j = n - 1
+    for i in range(n):
+        xi, yi = polygon[i]
+        xj, yj = polygon[j]
+        if (yi > y) != (yj > y):
+            x_cross = (xj - xi) * (y - yi) / (yj - yi) + xi
+            if x < x_cross:
+                inside = not inside
+        j = i
+    return inside
+
+# CORE CLASSES
+class KDTree(object):
+    '''
+    A static k-d tree over a set of points stored as x and y arrays
+
+    Each node covers a run of the point indices in order and knows the
+    bounding box of its points. Nodes are split at the median of their
+    longest side until they hold LEAF_SIZE points or fewer, so the depth of
+    the tree only depends on the number of points and not on how they are
+    spread out. The tree is built once and is not changed afterwards
+    '''
+
+    def __init__(self, xs, ys):
+        self.xs = xs
+        self.ys = ys
+        self.order = list(range(len(xs)))
+
+        # the nodes are stored as parallel lists. a leaf has no children
+        self.start = []
+        self.end = []
+        self.left = []
+        self.right = []
+        self.bounds = []
+
+        if len(xs) > 0:
+            self._build()
+
+    def _new_node(self, start, end):
+        '''
+        Adds a node covering order[start:end] and returns its id
+        '''
+        self.start.append(start)
+        self.end.append(end)
+        self.left.append(None)
+        self.right.append(None)
+        self.bounds.append(None)
+        return len(self.start) - 1
+
+    def _build(self):
+        '''
+        Splits the nodes until every leaf is small enough
+        '''
+
+        xs = self.xs
+        ys = self.ys
+        stack = [self._new_node(0, len(xs))]
+        while stack:
+            node = stack.pop()
+            start = self.start[node]
+            end = self.end[node]
+            ids = self.order[start:end]
+            node_xs = [xs[i] for i in ids]
+            node_ys = [ys[i] for i in ids]
+            bounds = (min(node_xs), min(node_ys), max(node_xs), max(node_ys))
+            self.bounds[node] = bounds
+
+            width = bounds[2] - bounds[0]
+            height = bounds[3] - bounds[1]
+            if end - start <= LEAF_SIZE or (width == 0 and height == 0):
+                continue
+
+            # split at the median of the longest side
+            if width >= height:
+                ids.sort(key=xs.__getitem__)
+            else:
+                ids.sort(key=ys.__getitem__)
+            self.order[start:end] = ids
+
+            middle = (start + end) // 2
+            self.left[node] = self._new_node(start, middle)
+            self.right[node] = self._new_node(middle, end)
+            stack.append(self.left[node])
+            stack.append(self.right[node])
+
+    def query_bbox(self, x_min, y_min, x_max, y_max):
+        '''
+        Returns the indices of the points inside a bounding box
+
+        Parameters
+        ----------
+        x_min, y_min, x_max, y_max : float
+            the bounds of the box, inclusive
+
+        Returns
+        -------
+        list of int
+            indices into the x and y arrays
+        '''
+
+        found = []
+        if len(self.start) == 0:
+            return found
+
+        xs = self.xs
+        ys = self.ys
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            b = self.bounds[node]
+            if b[0] > x_max or b[2] < x_min or b[1] > y_max or b[3] < y_min:
+                continue
+
+            start = self.start[node]
+            end = self.end[node]
+            if x_min <= b[0] and b[2] <= x_max and y_min <= b[1] and b[3] <= y_max:
+                # every point of the node is inside the box
+                found.extend(self.order[start:end])
+            elif self.left[node] is None:
+                for i in self.order[start:end]:
+                    if x_min <= xs[i] <= x_max and y_min <= ys[i] <= y_max:
+                        found.append(i)
+            else:
+                stack.append(self.left[node])
+                stack.append(self.right[node])
+        return found
+
+    def _distance(self, node, x, y):
+        '''
+        Returns the distance from a coordinate to the bounding box of a node
+        '''
+        b = self.bounds[node]
+        dx = max(b[0] - x, 0, x - b[2])
+        dy = max(b[1] - y, 0, y - b[3])
+        return math.hypot(dx, dy)
+
+    def nearest(self, x, y):
+        '''
+        Returns the index of the point nearest to a coordinate
+
+        The nodes are visited closest first and the search stops once the
+        closest unvisited node is further away than the best point found
+
+        Parameters
+        ----------
+        x : float
+            x coordinate
+        y : float
+            y coordinate
+
+        Returns
+        -------
+        int or None
+            index into the x and y arrays, None if there are no points
+        '''
+
+        if len(self.start) == 0:
+            return None
+
+        best = None
+        best_dist = math.inf
+        xs = self.xs
+        ys = self.ys
+        heap = [(self._distance(0, x, y), 0)]
+        while heap:
+            dist, node = heapq.heappop(heap)
+            if dist >= best_dist:
+                break
+
+            if self.left[node] is None:
+                for i in self.order[self.start[node]:self.end[node]]:
+                    d = math.hypot(xs[i] - x, ys[i] - y)
+                    if d < best_dist:
+                        best = i
+                        best_dist = d
+            else:
+                for child in (self.left[node], self.right[node]):
+                    heapq.heappush(heap, (self._distance(child, x, y), child))
+        return best
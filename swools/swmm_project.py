@@ -12,6 +12,9 @@ A collection of SWMM objects:
 - TITLE
 - OPTIONS
 - FILES
+- COORDINATES
+- VERTICES
+- POLYGONS
 
 Nodes
 - OUTFALLS
@@ -31,9 +34,68 @@ import sys
 from objects.sim_options import Options
 from objects.interface_files import Files
 from objects.title import Title
+from objects.coordinates import Coordinates, Vertices, Polygons
 
 # GLOBAL VARIABLES
 
+# sections whose rows are keyed on the element named in the first column,
+# and the kind of element it is
+KEYED_SECTIONS = {'JUNCTIONS': 'node',
+                  'OUTFALLS': 'node',
+                  'DIVIDERS': 'node',
+                  'STORAGE': 'node',
+                  'INFLOWS': 'node',
+                  'DWF': 'node',
+                  'RDII': 'node',
+                  'TREATMENT': 'node',
+                  'COORDINATES': 'node',
+                  'XSECTIONS': 'link',
+                  'LOSSES': 'link',
+                  'VERTICES': 'link',
+                  'SUBAREAS': 'subcatch',
+                  'INFILTRATION': 'subcatch',
+                  'POLYGONS': 'subcatch',
+                  'COVERAGES': 'subcatch',
+                  'LOADINGS': 'subcatch',
+                  'GROUNDWATER': 'subcatch',
+                  'GWF': 'subcatch',
+                  'LID_USAGE': 'subcatch'}
+
+# sections of links whose second and third columns are the end nodes
+NODE_LINK_SECTIONS = ['CONDUITS', 'PUMPS', 'ORIFICES', 'WEIRS', 'OUTLETS']
+
+# sections of subcatchments whose third column is the outlet
+SUBCATCHMENT_SECTIONS = ['SUBCATCHMENTS']
+
+# keyed sections that also name a node, and the column of the node. rows
+# naming a node that is not kept are dropped
+NODE_REFERENCES = {'GROUNDWATER': 2}
+
+# the lists of elements in the REPORT section, and the kind of element
+REPORT_LISTS = {'NODES': 'node', 'LINKS': 'link', 'SUBCATCHMENTS': 'subcatch'}
+
+# the objects named in CONTROLS rules, and the kind of element they are
+RULE_OBJECTS = {'NODE': 'node',
+                'JUNCTION': 'node',
+                'STORAGE': 'node',
+                'OUTFALL': 'node',
+                'LINK': 'link',
+                'CONDUIT': 'link',
+                'PUMP': 'link',
+                'ORIFICE': 'link',
+                'WEIR': 'link',
+                'OUTLET': 'link'}
+
+# the first column of the TAGS section
+TAG_TYPES = {'NODE': 'node', 'LINK': 'link', 'SUBCATCH': 'subcatch'}
+
+# sections that describe the whole project and are never merged
+PROJECT_SECTIONS = ['TITLE', 'OPTIONS', 'REPORT', 'EVAPORATION', 'TEMPERATURE',
+                    'ADJUSTMENTS', 'MAP', 'BACKDROP', 'CONTROLS', 'TRANSECTS']
+
+# sections whose rows are only the same when the whole row is the same
+WHOLE_ROW_SECTIONS = ['FILES', 'LABELS']
+
 # FUNCTIONS
 def unrecorded_section_check(line):
     '''
@@ -50,9 +112,97 @@ def unrecorded_section_check(line):
     '''
 
     not_found = True
-    if line[0] == '[' and line.strip()[-1] == ']':
+    if line.startswith('[') and line.strip().endswith(']'):
         print('Section {} has no associated class'.format(line.strip()))
 
+def _row_key(section, line):
+    '''
+    Returns the key used to match a row between two projects
+
+    Parameters
+    ----------
+    section: str
+        the name of the section holding the row
+    line: str
+        the row of the .inp file
+
+    Returns
+    -------
+    str or tuple
+        the element name, or the columns of the row if the section is not
+        keyed on element names
+    '''
+
+    temp = line.split()
+    if section == 'TAGS':
+        return (temp[0].upper(), temp[1])
+    elif section in WHOLE_ROW_SECTIONS:
+        return tuple(temp)
+    else:
+        return temp[0]
+
+def _rule_elements(line):
+    '''
+    Returns the elements named in a line of a CONTROLS rule
+
+    Parameters
+    ----------
+    line: str
+        a line of a rule, e.g. IF NODE J1 DEPTH > 5
+
+    Returns
+    -------
+    list of tuple
+        the (kind, name) of each element
+    '''
+
+    temp = line.split(';')[0].split()
+    elements = []
+    for i in range(len(temp) - 1):
+        kind = RULE_OBJECTS.get(temp[i].upper())
+        if kind is not None:
+            elements.append((kind, temp[i + 1]))
+    return elements
+
+def _close_rule(lines, rule):
+    '''
+    Adds a held back CONTROLS rule to the lines, keeping the blank lines
+    after it out of the rule so they stay when the rule is dropped
+    '''
+    blanks = []
+    while rule[2] and rule[2][-1].strip() == '':
+        blanks.insert(0, rule[2].pop())
+    lines.append(rule)
+    lines.extend(blanks)
+
+def _filter_report_line(line, selected):
+    '''
+    Cuts a NODES, LINKS or SUBCATCHMENTS line of the REPORT section down to
+    the selected elements
+
+    Parameters
+    ----------
+    line: str
+        the line of the REPORT section
+    selected: dict
+        the selected names of each kind of element
+
+    Returns
+    -------
+    list of str
+        the filtered line, or no lines if none of its elements are selected
+    '''
+
+    temp = line.split()
+    if len(temp) < 2 or temp[1].upper() in ('ALL', 'NONE'):
+        return [line]
+
+    kind = REPORT_LISTS[temp[0].upper()]
+    names = [name for name in temp[1:] if name in selected[kind]]
+    if len(names) == 0:
+        return []
+    return ['{} {}\n'.format(temp[0], ' '.join(names))]
+
 # exceptions
 class InpNameError(Exception):
     '''
@@ -68,11 +218,44 @@ class SWMMProject(object):
     '''
 
     def __init__(self, inp_file):
+        self._reset()
         self.inp_file = inp_file
-        self._to_write = []
         self._read_inp_file()
 
 
+    @classmethod
+    def _from_lines(cls, lines):
+        '''
+        Creates a SWMMProject from the lines of a .inp file held in memory
+
+        Parameters
+        ----------
+        lines: list of str
+            the lines of the .inp file
+
+        Returns
+        -------
+        SWMMProject
+        '''
+
+        project = cls.__new__(cls)
+        project._reset()
+        project._read_lines(iter(lines), report_unrecorded=False)
+        return project
+
+    def _reset(self):
+        '''
+        Sets every section to its empty state
+        '''
+        self.inp_file = None
+        self.title = None
+        self.options = None
+        self.files = None
+        self.coordinates = None
+        self.vertices = None
+        self.polygons = None
+        self._to_write = []
+
     def _read_inp_file(self):
         '''
         Reads the SWMM .inp file and records the sections
@@ -82,33 +265,295 @@ class SWMMProject(object):
         None.
         '''
 
+        with open(self.inp_file, 'r') as inp_file:
+            self._read_lines(inp_file)
+
+    def _read_lines(self, inp_file, report_unrecorded=True):
+        '''
+        Reads the lines of a SWMM .inp file and records the sections
+
+        Parameters
+        ----------
+        inp_file : iterator of str
+            the SWMM .inp file or an iterator over its lines
+        report_unrecorded : bool
+            tell the user about sections with no associated class
+
+        Returns
+        -------
+        None.
+        '''
+
         # list of swmm elements
         swmm_elements = [Title(),
                         Options(),
-                        Files()]
+                        Files(),
+                        Coordinates(),
+                        Vertices(),
+                        Polygons()]
 
         # create a new attribute when a section has been located
-        with open(self.inp_file, 'r') as inp_file:
-            for line in inp_file:
-                for element in swmm_elements:
-                    if element.has_reached_section(line):
-                        line = element.temp_read_params(inp_file)
-
-                        # use the element type to designate the new attribute
-                        if isinstance(element, Title) = 'Title':
-                            self.title = element
-                        elif isinstance(element, Options) = 'Options':
-                            self.options = element
-                        elif isinstance(element, Files) = 'Files':
-                            self.files = element
-
-                        self._to_write.append(element)
-                    else:
-                        pass
+        for line in inp_file:
+            for element in swmm_elements:
+                if element.has_reached_section(line):
+                    line = element.read_params(inp_file)
+
+                    # OPTIONS and FILES write their own closing blank line,
+                    # so the blank line that ended them is not kept as well
+                    if isinstance(element, (Options, Files)) and line.strip() == '':
+                        line = ''
+
+                    # use the element type to designate the new attribute
+                    if isinstance(element, Title):
+                        self.title = element
+                    elif isinstance(element, Options):
+                        self.options = element
+                    elif isinstance(element, Files):
+                        self.files = element
+                    elif isinstance(element, Coordinates):
+                        self.coordinates = element
+                    elif isinstance(element, Vertices):
+                        self.vertices = element
+                    elif isinstance(element, Polygons):
+                        self.polygons = element
+
+                    self._to_write.append(element)
                 else:
-                    self._to_write.append(line)
+                    pass
+            else:
+                self._to_write.append(line)
+                if report_unrecorded:
                     unrecorded_section_check(line)
 
+    def _iter_lines(self):
+        '''
+        Yields the lines of the project as they would be written to a .inp
+        file, including any changes made to the parsed sections
+        '''
+        for item in self._to_write:
+            if isinstance(item, str):
+                yield item
+            else:
+                for line in str(item).splitlines(True):
+                    yield line
+
+    def extract(self, node_ids):
+        '''
+        Extracts the subnetwork made up of a set of nodes
+
+        Rows of the element-keyed sections are kept when they belong to one
+        of the nodes, to a link with both ends on the nodes or to a
+        subcatchment draining to the nodes, directly or through other
+        subcatchments. The NODES, LINKS and SUBCATCHMENTS lists of REPORT
+        are cut down to the kept elements, and CONTROLS rules are dropped
+        when they name a node or link that is not kept. GROUNDWATER rows are
+        dropped when their node is not kept. Every other section, including
+        TITLE, OPTIONS and FILES, is carried over as it is
+
+        A kept DIVIDERS row still names its diverted link even when that
+        link is not kept, as dropping the divider would leave its other
+        links without a node. Include the node at the far end of every
+        diverted link for the result to be a valid model
+
+        Parameters
+        ----------
+        node_ids: iterable of str
+            The names of the nodes to extract
+
+        Returns
+        -------
+        SWMMProject
+            The extracted subnetwork
+        '''
+
+        selected = {'node': set(node_ids), 'link': set(), 'subcatch': set()}
+
+        # the kinds of element whose selection is known before the pass.
+        # links and subcatchments can be defined anywhere in the file, so
+        # rows keyed on ones that are not kept yet are held back until the
+        # end of the pass
+        defined = {'node'}
+
+        # the subcatchments draining to each outlet that is not a kept node
+        drains_to = {}
+
+        lines = []
+        rule = None
+        section = None
+        for line in self._iter_lines():
+            stripped = line.strip()
+            if stripped.startswith('[') and stripped.endswith(']'):
+                if rule is not None:
+                    _close_rule(lines, rule)
+                    rule = None
+                section = stripped[1:-1].upper()
+                lines.append(line)
+                continue
+            elif section == 'CONTROLS':
+                # rules are held back whole along with the elements they name
+                if stripped.upper().startswith('RULE'):
+                    if rule is not None:
+                        _close_rule(lines, rule)
+                    rule = ('rule', [], [line])
+                elif rule is not None:
+                    rule[2].append(line)
+                    rule[1].extend(_rule_elements(line))
+                else:
+                    lines.append(line)
+                continue
+            elif stripped == '' or stripped.startswith(';'):
+                lines.append(line)
+                continue
+
+            temp = line.split()
+            if section in NODE_LINK_SECTIONS:
+                if temp[1] in selected['node'] and temp[2] in selected['node']:
+                    selected['link'].add(temp[0])
+                    lines.append(line)
+            elif section in SUBCATCHMENT_SECTIONS:
+                if temp[2] in selected['node']:
+                    selected['subcatch'].add(temp[0])
+                    lines.append(line)
+                else:
+                    drains_to.setdefault(temp[2], []).append(temp[0])
+                    lines.append(('row', 'subcatch', temp[0], line))
+            elif section in KEYED_SECTIONS:
+                kind = KEYED_SECTIONS[section]
+                if section in NODE_REFERENCES and temp[NODE_REFERENCES[section]] not in selected['node']:
+                    pass
+                elif temp[0] in selected[kind]:
+                    lines.append(line)
+                elif kind not in defined:
+                    lines.append(('row', kind, temp[0], line))
+            elif section == 'TAGS':
+                kind = TAG_TYPES.get(temp[0].upper())
+                if kind is None or temp[1] in selected[kind]:
+                    lines.append(line)
+                elif kind not in defined:
+                    lines.append(('row', kind, temp[1], line))
+            elif section == 'REPORT' and temp[0].upper() in REPORT_LISTS:
+                lines.append(('report', line))
+            else:
+                lines.append(line)
+
+        if rule is not None:
+            _close_rule(lines, rule)
+
+        # follow the subcatchments draining to kept subcatchments
+        to_visit = list(selected['subcatch'])
+        while to_visit:
+            for name in drains_to.get(to_visit.pop(), []):
+                if name not in selected['subcatch']:
+                    selected['subcatch'].add(name)
+                    to_visit.append(name)
+
+        # resolve the lines that were held back now every element is known
+        resolved = []
+        for l in lines:
+            if isinstance(l, str):
+                resolved.append(l)
+            elif l[0] == 'row':
+                if l[2] in selected[l[1]]:
+                    resolved.append(l[3])
+            elif l[0] == 'report':
+                resolved.extend(_filter_report_line(l[1], selected))
+            elif all(name in selected[kind] for kind, name in l[1]):
+                resolved.extend(l[2])
+
+        return SWMMProject._from_lines(resolved)
+
+    def merge(self, other):
+        '''
+        Merges another project into this one
+
+        Rows of other replace the rows of this project with the same
+        element name, and rows for new elements are added to the end of
+        their section. TITLE, OPTIONS and the other project wide sections
+        are kept from this project, and FILES is the union of both projects'
+        interface files. Sections only found in other are added to the end
+
+        Parameters
+        ----------
+        other: SWMMProject
+            The project to merge in, usually one returned by extract
+
+        Returns
+        -------
+        SWMMProject
+            The merged project
+        '''
+
+        # index the rows of other by section and row key
+        other_sections = {}
+        section = None
+        for line in other._iter_lines():
+            stripped = line.strip()
+            if stripped.startswith('[') and stripped.endswith(']'):
+                section = stripped[1:-1].upper()
+                other_sections[section] = {'lines': [line], 'rows': {}}
+            elif section is not None:
+                other_sections[section]['lines'].append(line)
+                if stripped != '' and not stripped.startswith(';'):
+                    rows = other_sections[section]['rows']
+                    key = _row_key(section, line)
+                    if key in rows:
+                        rows[key].append(line)
+                    else:
+                        rows[key] = [line]
+
+        lines = []
+        blanks = []
+        section = None
+        rows = {}
+        replaced = set()
+        for line in self._iter_lines():
+            stripped = line.strip()
+            if stripped.startswith('[') and stripped.endswith(']'):
+                # add the rows of other that were not found in this section
+                for new_rows in rows.values():
+                    lines.extend(new_rows)
+                lines.extend(blanks)
+                blanks = []
+
+                section = stripped[1:-1].upper()
+                if section in other_sections and section not in PROJECT_SECTIONS:
+                    rows = other_sections.pop(section)['rows']
+                else:
+                    other_sections.pop(section, None)
+                    rows = {}
+                replaced = set()
+                lines.append(line)
+                continue
+            elif stripped == '':
+                blanks.append(line)
+                continue
+
+            lines.extend(blanks)
+            blanks = []
+            if stripped.startswith(';'):
+                lines.append(line)
+                continue
+
+            # an element may span several rows, all of which are replaced
+            key = _row_key(section, line)
+            if key in rows:
+                lines.extend(rows.pop(key))
+                replaced.add(key)
+            elif key not in replaced:
+                lines.append(line)
+
+        for new_rows in rows.values():
+            lines.extend(new_rows)
+        lines.extend(blanks)
+
+        # sections only in other go at the end
+        for other_section in other_sections.values():
+            if lines and lines[-1].strip() != '':
+                lines.append('\n')
+            lines.extend(other_section['lines'])
+
+        return SWMMProject._from_lines(lines)
+
     def write_to_file(self, name, dir_path):
         '''
         Writes to a SWMM inp file
@@ -0,0 +1,103 @@
+'''
+Tests for the SQLite catalog of SWMM .inp files
+'''
+
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+from catalog import Catalog
+
+TEST_DIR = Path(__file__).resolve().parent
+
+@pytest.fixture
+def portfolio(tmp_path):
+    models = tmp_path / 'models'
+    models.mkdir()
+    for name in ('catalog_1.inp', 'catalog_2.inp'):
+        shutil.copy(TEST_DIR / name, models / name)
+    return models
+
+@pytest.fixture
+def catalog(tmp_path):
+    catalog = Catalog(tmp_path / 'catalog.db')
+    yield catalog
+    catalog.close()
+
+def test_index_and_query(portfolio, catalog):
+    assert catalog.index(portfolio) == 2
+
+    model_1 = str((portfolio / 'catalog_1.inp').resolve())
+    model_2 = str((portfolio / 'catalog_2.inp').resolve())
+
+    assert catalog.find_models("flow_routing = 'DYNWAVE' AND threads > ?", (1,)) == [model_1]
+    assert catalog.find_models("inertial_damping = 'PARTIAL'") == [model_1]
+    assert catalog.section_counts(model_1) == {'TITLE': 1, 'OPTIONS': 5, 'FILES': 2,
+                                               'JUNCTIONS': 2, 'CONDUITS': 1}
+
+def test_unknown_options_keep_the_rest_of_the_model(portfolio, catalog):
+    catalog.index(portfolio)
+    model_1 = str((portfolio / 'catalog_1.inp').resolve())
+
+    assert catalog.find_models('threads = 4') == [model_1]
+    assert catalog.section_counts(model_1)['FILES'] == 2
+    assert catalog.connection.execute('SELECT param, value FROM extra_options').fetchall() == \
+        [('SURCHARGE_METHOD', 'EXTRAN')]
+    assert catalog.connection.execute('SELECT error FROM models').fetchall() == [(None,), (None,)]
+
+def test_interface_files(portfolio, catalog):
+    catalog.index(portfolio)
+    model_1 = str((portfolio / 'catalog_1.inp').resolve())
+    model_2 = str((portfolio / 'catalog_2.inp').resolve())
+    hotstart_dir = 'C:\\Models\\Hotstart'
+
+    assert catalog.find_interface_file_users(hotstart_dir, 'HOTSTART') == [model_1, model_2]
+    assert catalog.find_interface_file_users(hotstart_dir, 'HOTSTART', 'SAVE') == [model_1]
+    assert catalog.find_interface_file_users(hotstart_dir, 'HOTSTART', 'use') == [model_2]
+
+    # Windows directories are matched whatever their case
+    assert catalog.find_interface_file_users('c:\\models\\hotstart', 'HOTSTART') == \
+        [model_1, model_2]
+
+    # relative paths are resolved against the folder of the model
+    inflows_dir = str((portfolio / 'inflows').resolve())
+    assert catalog.find_interface_file_users(inflows_dir, 'INFLOWS') == [model_1]
+
+    # paths without quotes are read as well
+    hot_dir = str((portfolio / 'hot').resolve())
+    assert catalog.find_interface_file_users(hot_dir, 'HOTSTART', 'SAVE') == [model_2]
+    assert catalog.find_interface_file_users(hot_dir.upper(), 'HOTSTART') == []
+
+    names = catalog.connection.execute('SELECT name FROM interface_files ORDER BY name').fetchall()
+    assert names == [('catalog_1.hsf',), ('catalog_1.hsf',), ('catalog_1.txt',),
+                     ('catalog_2.hsf',)]
+
+def test_unchanged_files_are_skipped(portfolio, catalog):
+    assert catalog.index(portfolio) == 2
+    assert catalog.index(portfolio) == 0
+
+    # a new modification time with the same contents is not parsed again
+    model_1 = portfolio / 'catalog_1.inp'
+    stat = model_1.stat()
+    os.utime(model_1, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert catalog.index(portfolio) == 0
+
+def test_changed_files_are_indexed_again(portfolio, catalog):
+    catalog.index(portfolio)
+
+    model_2 = portfolio / 'catalog_2.inp'
+    model_2.write_text(model_2.read_text().replace('THREADS              1',
+                                                   'THREADS              8'))
+    assert catalog.index(str(model_2)) == 1
+    assert catalog.find_models('threads = 8') == [str(model_2.resolve())]
+    assert catalog.find_models('threads = 1') == []
+
+def test_prune(portfolio, catalog):
+    catalog.index(portfolio)
+    (portfolio / 'catalog_2.inp').unlink()
+
+    assert catalog.prune() == 1
+    assert catalog.find_models() == [str((portfolio / 'catalog_1.inp').resolve())]
+    assert catalog.connection.execute('SELECT COUNT(*) FROM interface_files').fetchone()[0] == 2
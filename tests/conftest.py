@@ -0,0 +1,9 @@
+'''
+Makes the swools modules importable in the same way as the scripts in
+the swools folder import each other
+'''
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'swools'))
@@ -0,0 +1,138 @@
+'''
+Tests for the COORDINATES, VERTICES and POLYGONS classes and the k-d tree
+they are indexed with
+'''
+
+import math
+import random
+from pathlib import Path
+
+import pytest
+
+from objects.coordinates import Coordinates, Vertices, Polygons, ElementNotFoundError
+from objects.spatial_index import KDTree, LEAF_SIZE, point_in_polygon
+
+TEST_DIR = Path(__file__).resolve().parent
+
+def read_section(cls, file_name='coordinates_1.inp'):
+    section = cls()
+    with open(TEST_DIR / file_name, 'r') as inp_file:
+        for line in inp_file:
+            if cls.has_reached_section(line):
+                section.read_params(inp_file)
+    return section
+
+def brute_nearest(xs, ys, x, y):
+    return min(range(len(xs)), key=lambda i: math.hypot(xs[i] - x, ys[i] - y))
+
+def brute_bbox(xs, ys, x_min, y_min, x_max, y_max):
+    return sorted(i for i in range(len(xs))
+                  if x_min <= xs[i] <= x_max and y_min <= ys[i] <= y_max)
+
+def skewed_points(seed):
+    '''
+    Two dense clusters far from the origin and a single node left at the
+    origin, as is common in real models
+    '''
+    rng = random.Random(seed)
+    xs = [0.0]
+    ys = [0.0]
+    for cx, cy in ((3e6, 1e6), (3.2e6, 1.1e6)):
+        for i in range(5000):
+            xs.append(rng.gauss(cx, 500))
+            ys.append(rng.gauss(cy, 500))
+    return xs, ys
+
+def test_read_and_write():
+    coordinates = read_section(Coordinates)
+    assert coordinates.names == ['J1', 'J2', 'J3', 'J4', 'J5']
+    assert list(coordinates.x) == [0, 10, 10, 0, 5]
+
+    lines = str(coordinates).splitlines()
+    assert lines[0] == '[COORDINATES]'
+    assert lines[3].split() == ['J1', '0.0', '0.0']
+
+    assert read_section(Vertices).return_points('C1') == [(2, 1), (4, 1)]
+
+def test_point_in_polygon():
+    square = [(0, 0), (10, 0), (10, 10), (0, 10)]
+    assert point_in_polygon(5, 5, square)
+    assert not point_in_polygon(15, 5, square)
+    assert not point_in_polygon(5, -1, square)
+
+@pytest.mark.parametrize('seed', [0, 1])
+def test_nearest_matches_brute_force(seed):
+    xs, ys = skewed_points(seed)
+    tree = KDTree(xs, ys)
+    rng = random.Random(seed + 100)
+    for i in range(200):
+        x = rng.uniform(-1e5, 3.3e6)
+        y = rng.uniform(-1e5, 1.2e6)
+        found = tree.nearest(x, y)
+        expected = brute_nearest(xs, ys, x, y)
+        assert math.hypot(xs[found] - x, ys[found] - y) == \
+            math.hypot(xs[expected] - x, ys[expected] - y)
+
+@pytest.mark.parametrize('seed', [0, 1])
+def test_bbox_matches_brute_force(seed):
+    xs, ys = skewed_points(seed)
+    tree = KDTree(xs, ys)
+    rng = random.Random(seed + 200)
+    boxes = [(-1, -1, 1, 1), (-1e7, -1e7, 1e7, 1e7)]
+    for i in range(100):
+        x = rng.gauss(3e6, 1000)
+        y = rng.gauss(1e6, 1000)
+        size = rng.uniform(10, 2000)
+        boxes.append((x, y, x + size, y + size))
+    for box in boxes:
+        assert sorted(tree.query_bbox(*box)) == brute_bbox(xs, ys, *box)
+
+def test_leaves_stay_small_with_outliers():
+    xs, ys = skewed_points(0)
+    tree = KDTree(xs, ys)
+    leaves = [n for n in range(len(tree.start)) if tree.left[n] is None]
+    assert max(tree.end[n] - tree.start[n] for n in leaves) <= LEAF_SIZE
+    assert sorted(tree.order) == list(range(len(xs)))
+
+def test_empty_and_duplicate_points():
+    assert KDTree([], []).nearest(0, 0) is None
+    assert KDTree([], []).query_bbox(0, 0, 1, 1) == []
+
+    tree = KDTree([1.0] * 100, [2.0] * 100)
+    assert tree.nearest(0, 0) is not None
+    assert len(tree.query_bbox(0, 0, 5, 5)) == 100
+
+def test_section_queries():
+    coordinates = read_section(Coordinates)
+    polygons = read_section(Polygons)
+
+    assert coordinates.nearest(9, 9) == 'J3'
+    assert coordinates.in_bbox(-1, -1, 6, 6) == ['J1', 'J5']
+    assert coordinates.in_polygon(polygons.return_points('S1')) == ['J5']
+    assert read_section(Vertices).in_bbox(0, 0, 5, 5) == ['C1']
+    assert polygons.nearest(100, 100) == 'S1'
+
+def test_index_reset_after_changes():
+    coordinates = read_section(Coordinates)
+    assert coordinates.nearest(100, 100) == 'J3'
+
+    coordinates.add_point('J6', 50, 50)
+    assert coordinates.nearest(100, 100) == 'J6'
+
+    coordinates.set_point('J1', 200, 200)
+    assert coordinates.nearest(100, 100) == 'J6'
+    assert coordinates.nearest(190, 190) == 'J1'
+    assert coordinates.in_bbox(-1, -1, 1, 1) == []
+
+    coordinates.remove_element('J1')
+    assert coordinates.nearest(190, 190) == 'J6'
+    assert 'J1' not in coordinates.in_bbox(-1e3, -1e3, 1e3, 1e3)
+
+def test_missing_element():
+    coordinates = read_section(Coordinates)
+    with pytest.raises(ElementNotFoundError):
+        coordinates.remove_element('X')
+    with pytest.raises(ElementNotFoundError):
+        coordinates.set_point('X', 0, 0)
+    with pytest.raises(ElementNotFoundError):
+        coordinates.return_points('X')
@@ -0,0 +1,137 @@
+'''
+Tests for reading, writing, extracting and merging SWMMProjects
+'''
+
+from pathlib import Path
+
+import pytest
+
+from swmm_project import SWMMProject
+
+TEST_DIR = Path(__file__).resolve().parent
+OPTIONS_DIR = TEST_DIR.parent / 'options_tests'
+
+def project_lines(project):
+    return ''.join(project._iter_lines()).splitlines()
+
+def section_rows(project, section):
+    '''
+    Returns the data rows of a section as lists of columns
+    '''
+    rows = []
+    current = None
+    for line in project._iter_lines():
+        stripped = line.strip()
+        if stripped.startswith('['):
+            current = stripped
+        elif current == '[{}]'.format(section) and stripped and not stripped.startswith(';'):
+            rows.append(stripped.split())
+    return rows
+
+def names(project, section):
+    return [row[0] for row in section_rows(project, section)]
+
+@pytest.fixture
+def project(capsys):
+    project = SWMMProject(TEST_DIR / 'project_1.inp')
+    capsys.readouterr()
+    return project
+
+def test_round_trip_keeps_blank_lines(tmp_path):
+    inp_file = OPTIONS_DIR / 'options_1.inp'
+    project = SWMMProject(inp_file)
+    project.write_to_file('out.inp', tmp_path)
+    assert (tmp_path / 'out.inp').read_text() == inp_file.read_text()
+
+def test_chained_extracts_keep_blank_lines(project):
+    extracted = project.extract([]).extract([]).extract([])
+    assert project_lines(extracted) == project_lines(project.extract([]))
+
+def test_extract_elements(project):
+    extracted = project.extract(['J1', 'J2', 'O1'])
+
+    assert names(extracted, 'JUNCTIONS') == ['J1', 'J2']
+    assert names(extracted, 'OUTFALLS') == ['O1']
+    assert names(extracted, 'CONDUITS') == ['C1', 'C2']
+    assert names(extracted, 'XSECTIONS') == ['C1', 'C2']
+    assert extracted.coordinates.names == ['J1', 'J2', 'O1']
+    assert extracted.vertices.names == ['C1', 'C1']
+
+    # S1 drains to S2, which is found later in the file
+    assert names(extracted, 'SUBCATCHMENTS') == ['S1', 'S2']
+    assert names(extracted, 'SUBAREAS') == ['S1', 'S2']
+    assert extracted.polygons.names == ['S1', 'S1', 'S2']
+    assert section_rows(extracted, 'TAGS') == [['Node', 'J1', 'a'], ['Subcatch', 'S1', 'c']]
+
+def test_extract_keeps_project_sections(project):
+    extracted = project.extract(['J1'])
+    assert extracted.title.title == project.title.title
+    assert str(extracted.options) == str(project.options)
+    assert str(extracted.files) == str(project.files)
+
+def test_extract_filters_report_and_controls(project):
+    extracted = project.extract(['J1', 'J2', 'O1'])
+
+    assert section_rows(extracted, 'REPORT') == [['INPUT', 'NO'],
+                                                 ['NODES', 'J1'],
+                                                 ['SUBCATCHMENTS', 'ALL']]
+
+    controls = section_rows(extracted, 'CONTROLS')
+    assert ['RULE', 'R1'] in controls
+    assert ['RULE', 'R2'] not in controls
+    assert ['THEN', 'CONDUIT', 'C3', 'STATUS', '=', 'CLOSED'] not in controls
+
+def test_extract_and_merge_are_silent(project, capsys):
+    project.merge(project.extract(['J1']))
+    assert capsys.readouterr().out == ''
+
+def test_merge_own_extract_is_unchanged(project):
+    merged = project.merge(project.extract(['J1', 'J2', 'O1']))
+    assert project_lines(merged) == project_lines(project)
+
+def test_merge_replaces_and_adds_rows(project):
+    extracted = project.extract(['J3', 'O1'])
+    extracted.coordinates.set_point('J3', 9, 9)
+    extracted.coordinates.add_point('J9', 5, 5)
+    extracted.files.add_file('HOTSTART', 'hot.hsf')
+
+    merged = project.merge(extracted)
+    i = merged.coordinates.names.index('J3')
+    assert (merged.coordinates.x[i], merged.coordinates.y[i]) == (9, 9)
+    assert merged.coordinates.names == ['J1', 'J2', 'J3', 'O1', 'J9']
+    assert [f.name for f in merged.files.interface_files] == ['inflows.txt', 'hot.hsf']
+    assert names(merged, 'JUNCTIONS') == ['J1', 'J2', 'J3']
+    assert merged.options.threads == 2
+
+@pytest.fixture
+def project_2(capsys):
+    project = SWMMProject(TEST_DIR / 'project_2.inp')
+    capsys.readouterr()
+    return project
+
+def test_extract_links_defined_after_their_rows(project_2):
+    extracted = project_2.extract(['J1', 'J2', 'O1'])
+
+    assert names(extracted, 'WEIRS') == ['W1']
+    assert names(extracted, 'ORIFICES') == ['OR1']
+    assert names(extracted, 'XSECTIONS') == ['W1', 'OR1']
+    assert names(extracted, 'LOSSES') == ['W1']
+    assert section_rows(extracted, 'TAGS') == [['Link', 'W1', 'a'], ['Link', 'OR1', 'b']]
+    assert extracted.vertices.names == ['W1']
+
+def test_extract_groundwater_needs_its_node(project_2):
+    extracted = project_2.extract(['J1', 'J2'])
+
+    assert names(extracted, 'SUBCATCHMENTS') == ['S1', 'S2']
+    assert names(extracted, 'GROUNDWATER') == ['S1']
+
+def test_extract_keeps_dividers(project_2):
+    # the far end of the diverted link is included, so the model is valid
+    extracted = project_2.extract(['D1', 'J1', 'J3'])
+    assert names(extracted, 'DIVIDERS') == ['D1']
+    assert names(extracted, 'CONDUITS') == ['L1', 'C1']
+
+    # without it the divider is kept and still names its diverted link
+    extracted = project_2.extract(['D1', 'J1'])
+    assert section_rows(extracted, 'DIVIDERS') == [['D1', '110', 'L1', 'CUTOFF', '0.5']]
+    assert names(extracted, 'CONDUITS') == ['C1']